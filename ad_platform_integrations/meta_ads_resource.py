@@ -18,6 +18,7 @@ from facebook_business.adobjects.adimage import AdImage
 from facebook_business.adobjects.adset import AdSet
 from facebook_business.adobjects.advideo import AdVideo
 from facebook_business.adobjects.campaign import Campaign
+from instrument import spans
 from pydantic import Field
 from pydantic import PrivateAttr
 from pydantic.v1 import BaseModel
@@ -145,54 +146,56 @@ class MetaAdsResource(ConfigurableResource):
     def launch_ad(
         self, meta_ads: MetaAdsIntegration, combination: Combination, daily_budget_usd: float
     ):
-        countries = (
-            combination.features.countries
-            if combination.features.countries
-            else DEFAULT_TARGETING_COUNTRY
-        )
-        platform_config = self._get_platform_config("both")
-        ad_set_id = self._create_ad_set(
-            ad_account_id=meta_ads.meta_adaccount_id,
-            campaign_id=meta_ads.meta_adaccount_id,
-            page_id=meta_ads.page_id,
-            shop_product_id=combination.shop_product_id,
-            pixel_id=meta_ads.pixel_id,
-            daily_budget_usd=daily_budget_usd,
-            countries=countries,
-            gender=combination.features.gender,
-            start_time=datetime.now().strftime("%Y-%m-%dT%H:%M:%S%z"),
-            end_time=datetime.now() + timedelta(days=7),
-            publisher_platforms=platform_config["publisher_platforms"],
-            facebook_positions=platform_config["facebook_positions"],
-            instagram_positions=platform_config["instagram_positions"],
-            audience_network_positions=platform_config["audience_network_positions"],
-            messenger_positions=platform_config["messenger_positions"],
-        )
-
-        video_id = self._upload_video(meta_ads.meta_adaccount_id, combination.creative_url)
-        image_hash = self._upload_image(meta_ads.meta_adaccount_id, combination.thumbnail_url)
-
-        # Create ad creative
-        creative_id = self._create_ad_creative(
-            meta_ads.meta_adaccount_id,
-            video_id,
-            image_hash,
-            ad_title=combination.features.headline,
-            ad_message=combination.features.primary_text,
-            ad_description=combination.features.description,
-            website_url=combination.product_url,
-            page_id=meta_ads.page_id,
-            sku_name=combination.features.sku,
-            instagram_actor_id=meta_ads.page_id,
-            shop_product_id=combination.shop_product_id,
-        )
-
-        # Create ad
-        ad_id = self._create_ad(
-            meta_ads.meta_adaccount_id, ad_set_id, creative_id, combination.features.sku
-        )
-        return ad_id
-
+        with spans.span("meta_ads.launch_ad", trace_id=combination.id):
+            countries = (
+                combination.features.countries
+                if combination.features.countries
+                else DEFAULT_TARGETING_COUNTRY
+            )
+            platform_config = self._get_platform_config("both")
+            ad_set_id = self._create_ad_set(
+                ad_account_id=meta_ads.meta_adaccount_id,
+                campaign_id=meta_ads.meta_adaccount_id,
+                page_id=meta_ads.page_id,
+                shop_product_id=combination.shop_product_id,
+                pixel_id=meta_ads.pixel_id,
+                daily_budget_usd=daily_budget_usd,
+                countries=countries,
+                gender=combination.features.gender,
+                start_time=datetime.now().strftime("%Y-%m-%dT%H:%M:%S%z"),
+                end_time=datetime.now() + timedelta(days=7),
+                publisher_platforms=platform_config["publisher_platforms"],
+                facebook_positions=platform_config["facebook_positions"],
+                instagram_positions=platform_config["instagram_positions"],
+                audience_network_positions=platform_config["audience_network_positions"],
+                messenger_positions=platform_config["messenger_positions"],
+            )
+
+            video_id = self._upload_video(meta_ads.meta_adaccount_id, combination.creative_url)
+            image_hash = self._upload_image(meta_ads.meta_adaccount_id, combination.thumbnail_url)
+
+            # Create ad creative
+            creative_id = self._create_ad_creative(
+                meta_ads.meta_adaccount_id,
+                video_id,
+                image_hash,
+                ad_title=combination.features.headline,
+                ad_message=combination.features.primary_text,
+                ad_description=combination.features.description,
+                website_url=combination.product_url,
+                page_id=meta_ads.page_id,
+                sku_name=combination.features.sku,
+                instagram_actor_id=meta_ads.page_id,
+                shop_product_id=combination.shop_product_id,
+            )
+
+            # Create ad
+            ad_id = self._create_ad(
+                meta_ads.meta_adaccount_id, ad_set_id, creative_id, combination.features.sku
+            )
+            return ad_id
+
+    @spans.timed("meta_ads.create_ad_set")
     def _create_ad_set(
         self,
         ad_account_id: str,
@@ -220,12 +223,15 @@ class MetaAdsResource(ConfigurableResource):
     def _get_platform_config(self, platform: str = "both"):
         ...
 
+    @spans.timed("meta_ads.upload_video")
     def _upload_video(self, ad_account_id, video_url):
         ...
 
+    @spans.timed("meta_ads.upload_image")
     def _upload_image(self, ad_account_id, image_url):
         ...
 
+    @spans.timed("meta_ads.create_ad_creative")
     def _create_ad_creative(
         self,
         ad_account_id,
@@ -243,6 +249,7 @@ class MetaAdsResource(ConfigurableResource):
     ):
         ...
 
+    @spans.timed("meta_ads.create_ad")
     def _create_ad(self, ad_account_id, ad_set_id, creative_id, sku_name):
         ad = Ad(parent_id=f"act_{ad_account_id}")
         ad_name = f"{sku_name} - Ad"
@@ -0,0 +1,39 @@
+import dagster as dg
+
+from ad_platform_integrations.meta_insights_resource import MetaInsightsResource
+
+# Account-level change detection is one cheap call per account, so frequent runs only pull what changed
+SYNC_META_INSIGHTS_CRON = "*/15 * * * *"
+
+
+@dg.op
+def sync_meta_insights(context: dg.OpExecutionContext, meta_insights_resource: MetaInsightsResource) -> int:
+    integrations = meta_insights_resource.load_integrations()
+    rows = meta_insights_resource.sync_insights(integrations)
+    context.log.info(f"Synced {rows} insights rows for {len(integrations)} Meta ad accounts")
+    return rows
+
+
+@dg.job
+def sync_meta_insights_job():
+    sync_meta_insights()
+
+
+def _no_sync_in_progress(context: dg.ScheduleEvaluationContext) -> bool:
+    # A run still waiting on report jobs must not overlap with the next one
+    in_progress = context.instance.get_run_records(
+        filters=dg.RunsFilter(
+            job_name=sync_meta_insights_job.name,
+            statuses=[dg.DagsterRunStatus.QUEUED, dg.DagsterRunStatus.STARTING, dg.DagsterRunStatus.STARTED],
+        ),
+        limit=1,
+    )
+    return not in_progress
+
+
+sync_meta_insights_schedule = dg.ScheduleDefinition(
+    job=sync_meta_insights_job,
+    cron_schedule=SYNC_META_INSIGHTS_CRON,
+    should_execute=_no_sync_in_progress,
+    default_status=dg.DefaultScheduleStatus.RUNNING,
+)
@@ -11,6 +11,7 @@ from sqlalchemy.ext.asyncio import (
 )
 from sqlalchemy.orm import sessionmaker
 from app.models.base_model import BaseModel, ModelType
+from app.utils.query_stats import install_query_stats
 
 
 class DatabaseSessionManager:
@@ -19,6 +20,8 @@ class DatabaseSessionManager:
         self._sessionmaker = async_sessionmaker(autocommit=False, bind=self._engine, expire_on_commit=False)
         self._sync_engine = create_engine(host, **engine_kwargs)
         self._sync_sessionmaker = sessionmaker(self._sync_engine)
+        install_query_stats(self._engine.sync_engine)
+        install_query_stats(self._sync_engine)
 
     async def close(self):
         if self._engine is None:
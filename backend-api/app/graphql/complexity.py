@@ -0,0 +1,103 @@
+from typing import Optional
+
+from graphql import (
+    FieldNode,
+    FragmentSpreadNode,
+    GraphQLError,
+    GraphQLInterfaceType,
+    GraphQLNamedType,
+    GraphQLObjectType,
+    GraphQLOutputType,
+    InlineFragmentNode,
+    IntValueNode,
+    OperationDefinitionNode,
+    SelectionSetNode,
+    ValidationRule,
+    get_named_type,
+    get_nullable_type,
+    is_list_type,
+)
+
+PAGINATION_ARGUMENTS = ("first", "last", "limit")
+
+
+def query_cost_rule(max_cost: int, default_list_size: int = 10) -> type[ValidationRule]:
+    """
+    Builds a validation rule that rejects operations whose estimated cost exceeds `max_cost`.
+
+    Every selected field costs 1, multiplied by the expected size of each enclosing list.
+    A list's size comes from a literal `first`/`last`/`limit` argument, or `default_list_size`
+    when it is not given (or passed as a variable, which is unknown at validation time).
+    """
+
+    class QueryCostRule(ValidationRule):
+        def enter_operation_definition(self, node: OperationDefinitionNode, *_args):
+            root_type = self.context.schema.get_root_type(node.operation)
+            cost = self._selection_set_cost(node.selection_set, root_type, 1, set())
+            if cost > max_cost:
+                self.report_error(
+                    GraphQLError(
+                        f"'{node.name.value if node.name else 'anonymous'}' has a cost of {cost}, "
+                        f"which exceeds the maximum allowed cost of {max_cost}",
+                        node,
+                    )
+                )
+
+        def _selection_set_cost(
+            self,
+            selection_set: SelectionSetNode,
+            parent_type: Optional[GraphQLNamedType],
+            multiplier: int,
+            visited_fragments: set[str],
+        ) -> int:
+            cost = 0
+            for selection in selection_set.selections:
+                if isinstance(selection, FieldNode):
+                    cost += multiplier
+                    if selection.selection_set is None:
+                        continue
+                    field_type = self._field_type(parent_type, selection.name.value)
+                    child_multiplier = multiplier * self._list_size(selection, field_type)
+                    cost += self._selection_set_cost(
+                        selection.selection_set,
+                        get_named_type(field_type) if field_type else None,
+                        child_multiplier,
+                        visited_fragments,
+                    )
+                elif isinstance(selection, InlineFragmentNode):
+                    fragment_type = parent_type
+                    if selection.type_condition:
+                        fragment_type = self.context.schema.get_type(selection.type_condition.name.value)
+                    cost += self._selection_set_cost(
+                        selection.selection_set, fragment_type, multiplier, visited_fragments
+                    )
+                elif isinstance(selection, FragmentSpreadNode):
+                    name = selection.name.value
+                    fragment = self.context.get_fragment(name)
+                    if fragment is None or name in visited_fragments:
+                        continue
+                    cost += self._selection_set_cost(
+                        fragment.selection_set,
+                        self.context.schema.get_type(fragment.type_condition.name.value),
+                        multiplier,
+                        visited_fragments | {name},
+                    )
+            return cost
+
+        @staticmethod
+        def _field_type(parent_type: Optional[GraphQLNamedType], field_name: str) -> Optional[GraphQLOutputType]:
+            if not isinstance(parent_type, (GraphQLObjectType, GraphQLInterfaceType)):
+                return None
+            field = parent_type.fields.get(field_name)
+            return field.type if field else None
+
+        @staticmethod
+        def _list_size(node: FieldNode, field_type: Optional[GraphQLOutputType]) -> int:
+            if field_type is None or not is_list_type(get_nullable_type(field_type)):
+                return 1
+            for argument in node.arguments:
+                if argument.name.value in PAGINATION_ARGUMENTS and isinstance(argument.value, IntValueNode):
+                    return max(int(argument.value.value), 1)
+            return default_list_size
+
+    return QueryCostRule
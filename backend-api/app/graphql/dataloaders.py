@@ -0,0 +1,55 @@
+from collections import defaultdict
+from typing import Any, Optional, Sequence
+
+from sqlalchemy import select
+from strawberry.dataloader import DataLoader
+
+from app.database import sessionmanager
+from app.models.base_model import ModelType
+
+
+async def _load_by_ids(model: type[ModelType], ids: Sequence[Any]) -> list[Optional[ModelType]]:
+    async with sessionmanager.session() as session:
+        rows = (await session.scalars(select(model).where(model.id.in_(ids)))).all()
+    rows_by_id = {row.id: row for row in rows}
+    return [rows_by_id.get(id_) for id_ in ids]
+
+
+async def _load_many_by_column(
+    model: type[ModelType], column: str, keys: Sequence[Any]
+) -> list[list[ModelType]]:
+    model_column = getattr(model, column)
+    async with sessionmanager.session() as session:
+        rows = (await session.scalars(select(model).where(model_column.in_(keys)))).all()
+    rows_by_key: dict[Any, list[ModelType]] = defaultdict(list)
+    for row in rows:
+        rows_by_key[getattr(row, column)].append(row)
+    return [rows_by_key.get(key, []) for key in keys]
+
+
+class ModelLoaders:
+    """
+    Per-request DataLoaders. Every `.load()` issued in the same tick is coalesced into
+    a single `IN (...)` query and the results are cached for the rest of the request.
+
+    Usage in a resolver:
+        integration = await info.context.loaders.by_id(Integration).load(self.integration_id)
+        generations = await info.context.loaders.many_by(Generation, "integration_id").load(self.id)
+    """
+
+    def __init__(self):
+        self._loaders: dict[tuple[type, Optional[str]], DataLoader] = {}
+
+    def by_id(self, model: type[ModelType]) -> DataLoader[Any, Optional[ModelType]]:
+        key = (model, None)
+        if key not in self._loaders:
+            self._loaders[key] = DataLoader(load_fn=lambda ids: _load_by_ids(model, ids))
+        return self._loaders[key]
+
+    def many_by(self, model: type[ModelType], column: str) -> DataLoader[Any, list[ModelType]]:
+        key = (model, column)
+        if key not in self._loaders:
+            self._loaders[key] = DataLoader(
+                load_fn=lambda keys: _load_many_by_column(model, column, keys)
+            )
+        return self._loaders[key]
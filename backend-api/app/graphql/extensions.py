@@ -0,0 +1,93 @@
+import time
+from inspect import isawaitable
+
+from loguru import logger
+from strawberry.extensions import (
+    AddValidationRules,
+    ParserCache,
+    QueryDepthLimiter,
+    SchemaExtension,
+    ValidationCache,
+)
+from strawberry.extensions.tracing.utils import should_skip_tracing
+
+from app.config import settings, Environment
+from app.graphql.complexity import query_cost_rule
+from app.graphql.persisted_queries import persisted_query_store
+from app.performance_settings import performance_settings
+from app.utils.metrics import histogram
+from app.utils.query_stats import track_queries
+
+OPERATION_SECONDS = histogram("graphql_operation_seconds", "GraphQL operation latency", "operation")
+OPERATION_DB_SECONDS = histogram("graphql_operation_db_seconds", "Time spent in SQL per GraphQL operation", "operation")
+RESOLVER_SECONDS = histogram("graphql_resolver_seconds", "GraphQL resolver latency", "field")
+
+
+class QueryCountExtension(SchemaExtension):
+    """
+    Logs the number of SQL queries each GraphQL operation issued and records the operation
+    latency and its DB time. On local environments the count is also returned in the
+    response `extensions`.
+    """
+
+    def on_operation(self):
+        start = time.perf_counter()
+        with track_queries() as stats:
+            self._stats = stats
+            yield
+        operation_name = self.execution_context.operation_name or "<anonymous>"
+        # operationName is client-controlled, only known operations get their own label
+        operation_label = persisted_query_store.operation_label(self.execution_context.operation_name)
+        OPERATION_SECONDS.observe(time.perf_counter() - start, operation_label)
+        OPERATION_DB_SECONDS.observe(stats.duration, operation_label)
+        logger.info(
+            "GraphQL operation {} issued {} SQL queries ({:.1f} ms)",
+            operation_name,
+            stats.count,
+            stats.duration * 1000,
+        )
+
+    def get_results(self):
+        if settings.ENV != Environment.LOCAL:
+            return {}
+        return {"queryCount": self._stats.count}
+
+
+class ResolverTimingExtension(SchemaExtension):
+    """
+    Records the latency of every non-trivial resolver, labelled as `Type.field`.
+    Default attribute resolvers and introspection fields are skipped.
+    """
+
+    def resolve(self, _next, root, info, *args, **kwargs):
+        if should_skip_tracing(_next, info):
+            return _next(root, info, *args, **kwargs)
+
+        field = f"{info.parent_type.name}.{info.field_name}"
+        start = time.perf_counter()
+        result = _next(root, info, *args, **kwargs)
+        if isawaitable(result):
+            return self._observe_awaitable(result, field, start)
+        RESOLVER_SECONDS.observe(time.perf_counter() - start, field)
+        return result
+
+    @staticmethod
+    async def _observe_awaitable(result, field: str, start: float):
+        try:
+            return await result
+        finally:
+            RESOLVER_SECONDS.observe(time.perf_counter() - start, field)
+
+
+# Registered on the schema served by app.routers.graphql
+GRAPHQL_EXTENSIONS = [
+    QueryCountExtension,
+    ResolverTimingExtension,
+    # Validation rules have to be registered before ValidationCache so they are part of the cached result
+    QueryDepthLimiter(max_depth=performance_settings.GRAPHQL_MAX_QUERY_DEPTH),
+    AddValidationRules([query_cost_rule(max_cost=performance_settings.GRAPHQL_MAX_QUERY_COST)]),
+    # The frontend sends the same few dozen documents all day, so parsing and validation
+    # are cached by query text (persisted queries resolve to the same text).
+    ParserCache(maxsize=performance_settings.GRAPHQL_DOCUMENT_CACHE_SIZE),
+    ValidationCache(maxsize=performance_settings.GRAPHQL_DOCUMENT_CACHE_SIZE),
+]
@@ -0,0 +1,116 @@
+import hashlib
+import json
+from collections import OrderedDict
+from typing import Any, Optional
+
+from graphql import OperationDefinitionNode, parse
+from loguru import logger
+
+from app.performance_settings import performance_settings
+
+PERSISTED_QUERY_NOT_FOUND = "PERSISTED_QUERY_NOT_FOUND"
+PERSISTED_QUERY_NOT_SUPPORTED = "PERSISTED_QUERY_NOT_SUPPORTED"
+PERSISTED_QUERY_HASH_MISMATCH = "PERSISTED_QUERY_HASH_MISMATCH"
+
+
+class PersistedQueryError(Exception):
+    def __init__(self, message: str, code: str):
+        super().__init__(message)
+        self.message = message
+        self.code = code
+
+
+def hash_query(query: str) -> str:
+    return hashlib.sha256(query.encode("utf-8")).hexdigest()
+
+
+class PersistedQueryStore:
+    """
+    Maps sha256 hashes to query documents, following the Apollo automatic persisted queries
+    protocol: the client first sends only the hash and, on PersistedQueryNotFound, retries
+    with the full query so it can be registered.
+
+    Queries from the frontend build manifest are always known. When `persisted_only` is set,
+    only those are accepted and clients cannot register new ones.
+    """
+
+    def __init__(self, maxsize: int = 1000, manifest_path: Optional[str] = None, persisted_only: bool = False):
+        if persisted_only and not manifest_path:
+            # Every request would be rejected, fail at startup instead
+            raise ValueError("GRAPHQL_PERSISTED_QUERIES_ONLY requires GRAPHQL_PERSISTED_QUERIES_MANIFEST to be set")
+        self._maxsize = maxsize
+        self._persisted_only = persisted_only
+        self._manifest: dict[str, str] = {}
+        self._registered: OrderedDict[str, str] = OrderedDict()
+        self._manifest_operation_names: set[str] = set()
+        if manifest_path:
+            self._manifest = self._load_manifest(manifest_path)
+            self._manifest_operation_names = {
+                definition.name.value
+                for query in self._manifest.values()
+                for definition in parse(query).definitions
+                if isinstance(definition, OperationDefinitionNode) and definition.name
+            }
+
+    @staticmethod
+    def _load_manifest(manifest_path: str) -> dict[str, str]:
+        with open(manifest_path) as f:
+            manifest = json.load(f)
+        for query_hash, query in manifest.items():
+            if hash_query(query) != query_hash:
+                raise ValueError(f"Persisted query manifest entry {query_hash} does not match its query")
+        logger.info("Loaded {} persisted queries from {}", len(manifest), manifest_path)
+        return manifest
+
+    def operation_label(self, operation_name: Optional[str]) -> str:
+        """Metric label for an operation: client-sent names are only trusted when they are in the manifest."""
+        if not self._manifest_operation_names:
+            return operation_name or "<anonymous>"
+        return operation_name if operation_name in self._manifest_operation_names else "other"
+
+    def get(self, query_hash: str) -> Optional[str]:
+        if query_hash in self._manifest:
+            return self._manifest[query_hash]
+        query = self._registered.get(query_hash)
+        if query is not None:
+            self._registered.move_to_end(query_hash)
+        return query
+
+    def register(self, query_hash: str, query: str):
+        self._registered[query_hash] = query
+        self._registered.move_to_end(query_hash)
+        if len(self._registered) > self._maxsize:
+            self._registered.popitem(last=False)
+
+    def resolve(self, query: Optional[str], extensions: Optional[dict[str, Any]]) -> Optional[str]:
+        persisted_query = (extensions or {}).get("persistedQuery")
+        if not persisted_query:
+            if self._persisted_only:
+                raise PersistedQueryError("Only persisted queries are allowed", PERSISTED_QUERY_NOT_SUPPORTED)
+            return query
+
+        query_hash = persisted_query.get("sha256Hash")
+        if persisted_query.get("version") != 1 or not query_hash:
+            raise PersistedQueryError("Unsupported persisted query", PERSISTED_QUERY_NOT_SUPPORTED)
+
+        if query is None:
+            query = self.get(query_hash)
+            if query is None:
+                raise PersistedQueryError("PersistedQueryNotFound", PERSISTED_QUERY_NOT_FOUND)
+            return query
+
+        if hash_query(query) != query_hash:
+            raise PersistedQueryError("Provided sha256Hash does not match query", PERSISTED_QUERY_HASH_MISMATCH)
+        if self._persisted_only:
+            if query_hash not in self._manifest:
+                raise PersistedQueryError("Only persisted queries are allowed", PERSISTED_QUERY_NOT_SUPPORTED)
+        else:
+            self.register(query_hash, query)
+        return query
+
+
+persisted_query_store = PersistedQueryStore(
+    maxsize=performance_settings.GRAPHQL_PERSISTED_QUERIES_CACHE_SIZE,
+    manifest_path=performance_settings.GRAPHQL_PERSISTED_QUERIES_MANIFEST,
+    persisted_only=performance_settings.GRAPHQL_PERSISTED_QUERIES_ONLY,
+)
@@ -10,7 +10,8 @@ from sqlalchemy.ext.asyncio import create_async_engine
 from app.graphql.errors import UnauthorizedError
 from app.utils import logging_config
 from app.utils.context_management import set_loop
-from app.utils.middleware import add_request_id, add_user_id, log_request
+from app.utils.middleware import add_user_id
+from app.utils.request_context_middleware import RequestContextMiddleware
 from app.utils.sentry_scrub import scrub_email
 
 sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
@@ -30,6 +31,8 @@ from app.routers.tiktok import router as tiktok_router
 from app.routers.graphql import router as graphql_router
 from app.routers.gupshup import router as gupshup_router
 from app.routers.file import router as file_router
+from app.routers.metrics import router as metrics_router
+from app.routers.upload import router as upload_router
 
 
 if settings.SENTRY_DSN and settings.ENV != Environment.LOCAL:
@@ -88,9 +91,9 @@ async def lifespan(app: FastAPI):
 app = FastAPI(lifespan=lifespan, title=settings.PROJECT_NAME, docs_url="/api-docs")
 
 
-app.middleware("http")(add_request_id)
 app.middleware("http")(add_user_id)
-app.middleware("http")(log_request)
+# Added last so it wraps add_user_id: the request id is set first and the access log sees request.state.user_id
+app.add_middleware(RequestContextMiddleware)
 
 
 app.add_middleware(
@@ -146,3 +149,13 @@ app.include_router(
     prefix="/file",
     tags=["file"],
 )
+app.include_router(
+    upload_router,
+    prefix="/upload",
+    tags=["file"],
+)
+app.include_router(
+    metrics_router,
+    prefix="/metrics",
+    tags=["status"],
+)
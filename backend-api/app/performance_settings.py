@@ -0,0 +1,36 @@
+import os
+from dataclasses import dataclass, field
+from typing import Optional
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    return os.getenv(name, str(default)).lower() in ("1", "true", "yes")
+
+
+@dataclass(frozen=True)
+class PerformanceSettings:
+    """
+    Tunables for GraphQL caching/limits, metrics and streaming uploads.
+    Every value has a default and can be overridden through the environment variable of the same name.
+    """
+
+    GRAPHQL_PERSISTED_QUERIES_CACHE_SIZE: int = field(
+        default_factory=lambda: int(os.getenv("GRAPHQL_PERSISTED_QUERIES_CACHE_SIZE", "1000"))
+    )
+    GRAPHQL_PERSISTED_QUERIES_MANIFEST: Optional[str] = field(
+        default_factory=lambda: os.getenv("GRAPHQL_PERSISTED_QUERIES_MANIFEST") or None
+    )
+    GRAPHQL_PERSISTED_QUERIES_ONLY: bool = field(
+        default_factory=lambda: _env_bool("GRAPHQL_PERSISTED_QUERIES_ONLY", False)
+    )
+    GRAPHQL_DOCUMENT_CACHE_SIZE: int = field(default_factory=lambda: int(os.getenv("GRAPHQL_DOCUMENT_CACHE_SIZE", "256")))
+    GRAPHQL_MAX_QUERY_DEPTH: int = field(default_factory=lambda: int(os.getenv("GRAPHQL_MAX_QUERY_DEPTH", "10")))
+    GRAPHQL_MAX_QUERY_COST: int = field(default_factory=lambda: int(os.getenv("GRAPHQL_MAX_QUERY_COST", "5000")))
+    MAX_UPLOAD_SIZE: int = field(default_factory=lambda: int(os.getenv("MAX_UPLOAD_SIZE", str(500 * 1024 * 1024))))
+    S3_ENDPOINT_URL: Optional[str] = field(default_factory=lambda: os.getenv("S3_ENDPOINT_URL") or None)
+    # /metrics is disabled (404) unless a token is configured; scrapers send it as a bearer token
+    METRICS_TOKEN: Optional[str] = field(default_factory=lambda: os.getenv("METRICS_TOKEN") or None)
+    S3_UPLOADS_BUCKET: str = field(default_factory=lambda: os.getenv("S3_UPLOADS_BUCKET", "portal-uploads"))
+
+
+performance_settings = PerformanceSettings()
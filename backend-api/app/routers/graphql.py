@@ -1,10 +1,63 @@
+import copy
+
+from fastapi import Depends
+from graphql import GraphQLError
 from strawberry.fastapi import GraphQLRouter
+from strawberry.http import GraphQLRequestData
+from strawberry.http.async_base_view import AsyncHTTPRequestAdapter
+from strawberry.http.exceptions import HTTPException
+from strawberry.types import ExecutionResult
+
+from app.performance_settings import performance_settings
 from app.graphql.context import get_context
+from app.graphql.dataloaders import ModelLoaders
+from app.graphql.extensions import GRAPHQL_EXTENSIONS
+from app.graphql.persisted_queries import PersistedQueryError, PersistedQueryStore, persisted_query_store
 from app.graphql.schema import schema
+from app.utils.streaming_upload import parse_content_length
+
+# The served schema runs the query counting, timing, limits and caches. It is a copy so the shared
+# `schema` object stays untouched; Schema.get_extensions() reads `extensions` on every execution.
+served_schema = copy.copy(schema)
+served_schema.extensions = (*schema.extensions, *GRAPHQL_EXTENSIONS)
+
+
+async def get_context_with_loaders(context=Depends(get_context)):
+    context.loaders = ModelLoaders()
+    return context
+
+
+class PersistedQueryGraphQLRouter(GraphQLRouter):
+    def __init__(self, *args, persisted_query_store: PersistedQueryStore, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.persisted_query_store = persisted_query_store
+
+    async def parse_http_body(self, request: AsyncHTTPRequestAdapter) -> GraphQLRequestData:
+        # Multipart bodies are buffered by the form parser, so oversized uploads are rejected before
+        # reading them. Large files should go through the streaming /upload endpoint instead.
+        try:
+            content_length = parse_content_length(request.headers.get("content-length"))
+        except ValueError as e:
+            raise HTTPException(400, str(e))
+        if content_length is not None and content_length > performance_settings.MAX_UPLOAD_SIZE:
+            raise HTTPException(
+                413, f"Request body exceeds the maximum size of {performance_settings.MAX_UPLOAD_SIZE} bytes"
+            )
+        request_data = await super().parse_http_body(request)
+        request_data.query = self.persisted_query_store.resolve(request_data.query, request_data.extensions)
+        return request_data
+
+    async def execute_operation(self, *args, **kwargs) -> ExecutionResult:
+        try:
+            return await super().execute_operation(*args, **kwargs)
+        except PersistedQueryError as e:
+            return ExecutionResult(data=None, errors=[GraphQLError(e.message, extensions={"code": e.code})])
+
 
-router = GraphQLRouter(
-    schema=schema,
-    context_getter=get_context,
+router = PersistedQueryGraphQLRouter(
+    schema=served_schema,
+    context_getter=get_context_with_loaders,
     graphql_ide="apollo-sandbox",
     multipart_uploads_enabled=True,  # type: ignore
+    persisted_query_store=persisted_query_store,
 )
@@ -0,0 +1,41 @@
+import uuid
+from functools import lru_cache
+
+import boto3
+from fastapi import APIRouter, HTTPException, Request
+
+from app.performance_settings import performance_settings
+from app.utils.streaming_upload import UploadResult, parse_content_length, stream_multipart_file_to_s3
+
+router = APIRouter()
+
+
+@lru_cache
+def get_s3_client():
+    # S3_ENDPOINT_URL points at a local S3 stand-in (minio, moto server) in local and test environments
+    return boto3.client("s3", endpoint_url=performance_settings.S3_ENDPOINT_URL)
+
+
+@router.post("")
+async def stream_upload(request: Request) -> UploadResult:
+    user_id = getattr(request.state, "user_id", None)
+    if user_id is None:
+        raise HTTPException(status_code=401, detail="Unauthorized")
+
+    try:
+        content_length = parse_content_length(request.headers.get("content-length"))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if content_length is not None and content_length > performance_settings.MAX_UPLOAD_SIZE:
+        raise HTTPException(
+            status_code=413, detail=f"File exceeds the maximum size of {performance_settings.MAX_UPLOAD_SIZE} bytes"
+        )
+
+    return await stream_multipart_file_to_s3(
+        request.stream(),
+        request.headers.get("content-type", ""),
+        s3_client=get_s3_client(),
+        bucket=performance_settings.S3_UPLOADS_BUCKET,
+        key=f"uploads/{user_id}/{uuid.uuid4()}",
+        max_size=performance_settings.MAX_UPLOAD_SIZE,
+    )
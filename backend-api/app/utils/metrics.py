@@ -0,0 +1,76 @@
+import os
+from bisect import bisect_left
+from collections import defaultdict
+
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+DEFAULT_MAX_LABEL_VALUES = 200
+OVERFLOW_LABEL_VALUE = "other"
+
+
+class Histogram:
+    """
+    Minimal in-process histogram with a single label, rendered in the Prometheus text format.
+    Values are kept per worker process. Once `max_label_values` distinct label values have been seen,
+    new ones are recorded under "other" so memory stays bounded whatever the label source.
+
+    With several uvicorn/gunicorn workers each scrape reaches one of them, so every series also
+    carries the worker's `pid` label. Each series is then monotonic on its own, and queries
+    aggregate across workers, e.g. `sum without (pid) (rate(..._bucket[5m]))`.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        description: str,
+        label: str,
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+        max_label_values: int = DEFAULT_MAX_LABEL_VALUES,
+    ):
+        self.name = name
+        self.description = description
+        self.label = label
+        self.buckets = buckets
+        self.max_label_values = max_label_values
+        self._counts: dict[str, list[int]] = defaultdict(lambda: [0] * (len(buckets) + 1))
+        self._sums: dict[str, float] = defaultdict(float)
+
+    def observe(self, value: float, label_value: str):
+        if label_value not in self._counts and len(self._counts) >= self.max_label_values:
+            label_value = OVERFLOW_LABEL_VALUE
+        self._counts[label_value][bisect_left(self.buckets, value)] += 1
+        self._sums[label_value] += value
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.description}", f"# TYPE {self.name} histogram"]
+        pid = os.getpid()
+        for label_value, counts in sorted(self._counts.items()):
+            label_value = label_value.replace("\\", "\\\\").replace('"', '\\"')
+            labels = f'{self.label}="{label_value}",pid="{pid}"'
+            cumulative = 0
+            for bound, count in zip(self.buckets, counts):
+                cumulative += count
+                lines.append(f'{self.name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+            cumulative += counts[-1]
+            lines.append(f'{self.name}_bucket{{{labels},le="+Inf"}} {cumulative}')
+            lines.append(f'{self.name}_sum{{{labels}}} {self._sums[label_value]}')
+            lines.append(f'{self.name}_count{{{labels}}} {cumulative}')
+        return lines
+
+
+_registry: list[Histogram] = []
+
+
+def histogram(
+    name: str,
+    description: str,
+    label: str,
+    buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    max_label_values: int = DEFAULT_MAX_LABEL_VALUES,
+) -> Histogram:
+    metric = Histogram(name, description, label, buckets, max_label_values)
+    _registry.append(metric)
+    return metric
+
+
+def render_metrics() -> str:
+    return "\n".join(line for metric in _registry for line in metric.render()) + "\n"
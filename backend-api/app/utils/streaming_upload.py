@@ -0,0 +1,221 @@
+import hashlib
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Optional
+
+from fastapi import HTTPException
+from python_multipart.multipart import MultipartParser, parse_options_header
+from starlette.concurrency import run_in_threadpool
+
+# S3 requires every part but the last one to be at least 5 MiB
+MIN_PART_SIZE = 5 * 1024 * 1024
+DEFAULT_PART_SIZE = 8 * 1024 * 1024
+
+
+def parse_content_length(value: Optional[str]) -> Optional[int]:
+    """Content-Length header as an int, None when absent. Raises ValueError when malformed."""
+    if value is None:
+        return None
+    if not value.isdigit():
+        raise ValueError(f"Invalid Content-Length header: {value!r}")
+    return int(value)
+
+
+@dataclass
+class UploadResult:
+    bucket: str
+    key: str
+    size: int
+    sha256: str
+    filename: Optional[str] = None
+    content_type: Optional[str] = None
+
+
+class S3MultipartWriter:
+    """
+    Forwards a byte stream to S3 as a multipart upload.
+    At most one part is held in memory, and the content is hashed as it goes through.
+    """
+
+    def __init__(
+        self,
+        s3_client: Any,
+        bucket: str,
+        key: str,
+        max_size: int,
+        content_type: Optional[str] = None,
+        part_size: int = DEFAULT_PART_SIZE,
+    ):
+        if part_size < MIN_PART_SIZE:
+            raise ValueError(f"part_size must be at least {MIN_PART_SIZE} bytes")
+        self._s3_client = s3_client
+        self.bucket = bucket
+        self.key = key
+        self.content_type = content_type
+        self._max_size = max_size
+        self._part_size = part_size
+        self._buffer = bytearray()
+        self._hash = hashlib.sha256()
+        self._size = 0
+        self._upload_id: Optional[str] = None
+        self._parts: list[dict[str, Any]] = []
+
+    async def start(self):
+        kwargs = {"Bucket": self.bucket, "Key": self.key}
+        if self.content_type:
+            kwargs["ContentType"] = self.content_type
+        response = await run_in_threadpool(self._s3_client.create_multipart_upload, **kwargs)
+        self._upload_id = response["UploadId"]
+
+    async def write(self, data: bytes):
+        self._size += len(data)
+        if self._size > self._max_size:
+            raise HTTPException(status_code=413, detail=f"File exceeds the maximum size of {self._max_size} bytes")
+        self._hash.update(data)
+        self._buffer.extend(data)
+        while len(self._buffer) >= self._part_size:
+            await self._upload_part(self._part_size)
+
+    async def _upload_part(self, size: Optional[int] = None):
+        part_number = len(self._parts) + 1
+        size = len(self._buffer) if size is None else size
+        body = bytes(self._buffer[:size])
+        del self._buffer[:size]
+        response = await run_in_threadpool(
+            self._s3_client.upload_part,
+            Bucket=self.bucket,
+            Key=self.key,
+            UploadId=self._upload_id,
+            PartNumber=part_number,
+            Body=body,
+        )
+        self._parts.append({"PartNumber": part_number, "ETag": response["ETag"]})
+
+    async def complete(self) -> UploadResult:
+        if self._buffer or not self._parts:
+            await self._upload_part()
+        await run_in_threadpool(
+            self._s3_client.complete_multipart_upload,
+            Bucket=self.bucket,
+            Key=self.key,
+            UploadId=self._upload_id,
+            MultipartUpload={"Parts": self._parts},
+        )
+        return UploadResult(
+            bucket=self.bucket,
+            key=self.key,
+            size=self._size,
+            sha256=self._hash.hexdigest(),
+            content_type=self.content_type,
+        )
+
+    async def abort(self):
+        if self._upload_id is None:
+            return
+        await run_in_threadpool(
+            self._s3_client.abort_multipart_upload, Bucket=self.bucket, Key=self.key, UploadId=self._upload_id
+        )
+
+
+class _FilePartParser:
+    """
+    Wraps python-multipart's callback parser and collects the data of the first file part
+    of a multipart/form-data body. Other form fields are ignored.
+    """
+
+    def __init__(self, boundary: bytes):
+        self.filename: Optional[str] = None
+        self.content_type: Optional[str] = None
+        self.finished = False
+        self.pending: list[bytes] = []
+        self._in_file = False
+        self._header_field = b""
+        self._header_value = b""
+        self._headers: dict[bytes, bytes] = {}
+        self._parser = MultipartParser(
+            boundary,
+            {
+                "on_part_begin": self._on_part_begin,
+                "on_header_field": self._on_header_field,
+                "on_header_value": self._on_header_value,
+                "on_header_end": self._on_header_end,
+                "on_headers_finished": self._on_headers_finished,
+                "on_part_data": self._on_part_data,
+                "on_part_end": self._on_part_end,
+            },
+        )
+
+    def write(self, chunk: bytes):
+        self._parser.write(chunk)
+
+    def finalize(self):
+        self._parser.finalize()
+
+    def _on_part_begin(self):
+        self._headers = {}
+
+    def _on_header_field(self, data: bytes, start: int, end: int):
+        self._header_field += data[start:end]
+
+    def _on_header_value(self, data: bytes, start: int, end: int):
+        self._header_value += data[start:end]
+
+    def _on_header_end(self):
+        self._headers[self._header_field.lower()] = self._header_value
+        self._header_field = b""
+        self._header_value = b""
+
+    def _on_headers_finished(self):
+        _, options = parse_options_header(self._headers.get(b"content-disposition", b""))
+        if b"filename" in options and self.filename is None:
+            self._in_file = True
+            self.filename = options[b"filename"].decode("latin-1")
+            self.content_type = self._headers.get(b"content-type", b"application/octet-stream").decode("latin-1")
+
+    def _on_part_data(self, data: bytes, start: int, end: int):
+        if self._in_file:
+            self.pending.append(data[start:end])
+
+    def _on_part_end(self):
+        if self._in_file:
+            self._in_file = False
+            self.finished = True
+
+
+async def stream_multipart_file_to_s3(
+    stream: AsyncIterator[bytes],
+    content_type_header: str,
+    s3_client: Any,
+    bucket: str,
+    key: str,
+    max_size: int,
+    part_size: int = DEFAULT_PART_SIZE,
+) -> UploadResult:
+    """
+    Streams the first file of a multipart/form-data request body straight to S3,
+    without spooling the request body to memory or disk first.
+    """
+    content_type, options = parse_options_header(content_type_header)
+    if content_type != b"multipart/form-data" or b"boundary" not in options:
+        raise HTTPException(status_code=415, detail="Expected a multipart/form-data body")
+
+    parser = _FilePartParser(options[b"boundary"])
+    writer: Optional[S3MultipartWriter] = None
+    try:
+        async for chunk in stream:
+            parser.write(chunk)
+            if parser.filename is not None and writer is None:
+                writer = S3MultipartWriter(s3_client, bucket, key, max_size, parser.content_type, part_size)
+                await writer.start()
+            for data in parser.pending:
+                await writer.write(data)
+            parser.pending.clear()
+        parser.finalize()
+        if writer is None or not parser.finished:
+            raise HTTPException(status_code=400, detail="No file found in the request")
+        result = await writer.complete()
+    except BaseException:
+        if writer is not None:
+            await writer.abort()
+        raise
+    result.filename = parser.filename
+    return result
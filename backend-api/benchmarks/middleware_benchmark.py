@@ -0,0 +1,78 @@
+"""
+Compares the legacy BaseHTTPMiddleware stack with RequestContextMiddleware on a hello-world route.
+Both stacks authenticate with the same `add_user_id`, so pass a token the environment accepts
+(e.g. the access token returned by /token) or the numbers only measure the rejection path.
+
+Run from backend-api/:
+    BENCHMARK_TOKEN=<access token> python -m benchmarks.middleware_benchmark --requests 5000
+"""
+
+import argparse
+import asyncio
+import os
+import time
+
+import httpx
+from fastapi import FastAPI
+from loguru import logger
+
+from app.utils.middleware import add_request_id, add_user_id, log_request
+from app.utils.request_context_middleware import RequestContextMiddleware
+
+
+def build_app(legacy: bool) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/hello")
+    async def hello():
+        return {"hello": "world"}
+
+    if legacy:
+        app.middleware("http")(add_request_id)
+        app.middleware("http")(add_user_id)
+        app.middleware("http")(log_request)
+    else:
+        app.middleware("http")(add_user_id)
+        app.add_middleware(RequestContextMiddleware)
+    return app
+
+
+async def run(app: FastAPI, token: str, n_requests: int, concurrency: int) -> float:
+    transport = httpx.ASGITransport(app=app)
+    headers = {"Authorization": f"Bearer {token}"}
+    async with httpx.AsyncClient(transport=transport, base_url="http://benchmark") as client:
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def request():
+            async with semaphore:
+                response = await client.get("/hello", headers=headers)
+                response.raise_for_status()
+
+        await request()  # warm up
+        start = time.perf_counter()
+        await asyncio.gather(*(request() for _ in range(n_requests)))
+        return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--token", default=os.getenv("BENCHMARK_TOKEN"), help="valid access token (BENCHMARK_TOKEN)")
+    args = parser.parse_args()
+    if not args.token:
+        parser.error("a valid access token is required, pass --token or set BENCHMARK_TOKEN")
+
+    # Access logs would dominate the measurement
+    logger.remove()
+
+    for name, legacy in (("legacy middleware stack", True), ("RequestContextMiddleware", False)):
+        elapsed = asyncio.run(run(build_app(legacy), args.token, args.requests, args.concurrency))
+        print(
+            f"{name:<28} {args.requests / elapsed:>9.0f} req/s "
+            f"{elapsed / args.requests * 1e6:>8.1f} us/req"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+import asyncio
+import hashlib
+from unittest import mock
+
+import boto3
+import pytest
+from fastapi import HTTPException
+from moto import mock_aws
+
+from app.utils.streaming_upload import DEFAULT_PART_SIZE, stream_multipart_file_to_s3
+
+BUCKET = "test-uploads"
+BOUNDARY = "test-boundary"
+CONTENT_TYPE = f"multipart/form-data; boundary={BOUNDARY}"
+MiB = 1024 * 1024
+
+
+@pytest.fixture
+def s3_client():
+    with mock_aws():
+        client = boto3.client("s3", region_name="us-east-1")
+        client.create_bucket(Bucket=BUCKET)
+        with mock.patch.object(client, "upload_part", wraps=client.upload_part), mock.patch.object(
+            client, "abort_multipart_upload", wraps=client.abort_multipart_upload
+        ):
+            yield client
+
+
+def field_part(name: str, value: bytes) -> bytes:
+    return (
+        f'--{BOUNDARY}\r\nContent-Disposition: form-data; name="{name}"\r\n\r\n'.encode() + value + b"\r\n"
+    )
+
+
+def file_part(name: str, filename: str, content: bytes, content_type: str = "video/mp4") -> bytes:
+    return (
+        f'--{BOUNDARY}\r\nContent-Disposition: form-data; name="{name}"; filename="{filename}"\r\n'
+        f"Content-Type: {content_type}\r\n\r\n".encode()
+        + content
+        + b"\r\n"
+    )
+
+
+def multipart_body(*parts: bytes) -> bytes:
+    return b"".join(parts) + f"--{BOUNDARY}--\r\n".encode()
+
+
+async def chunked(body: bytes, chunk_size: int = 64 * 1024):
+    for i in range(0, len(body), chunk_size):
+        yield body[i : i + chunk_size]
+
+
+def upload(s3_client, body: bytes, max_size: int = 100 * MiB):
+    return asyncio.run(
+        stream_multipart_file_to_s3(chunked(body), CONTENT_TYPE, s3_client, BUCKET, "uploads/test", max_size)
+    )
+
+
+def test_streams_first_file_only(s3_client):
+    first = b"first file content"
+    body = multipart_body(
+        field_part("description", b"not a file"),
+        file_part("file", "first.mp4", first),
+        file_part("other", "second.png", b"second file content", "image/png"),
+    )
+
+    result = upload(s3_client, body)
+
+    assert result.filename == "first.mp4"
+    assert result.content_type == "video/mp4"
+    assert result.size == len(first)
+    assert result.sha256 == hashlib.sha256(first).hexdigest()
+    assert s3_client.get_object(Bucket=BUCKET, Key="uploads/test")["Body"].read() == first
+
+
+def test_splits_large_files_into_parts(s3_client):
+    content = bytes(range(256)) * (20 * MiB // 256)
+    body = multipart_body(file_part("file", "large.mp4", content))
+
+    result = upload(s3_client, body)
+
+    part_sizes = [len(call.kwargs["Body"]) for call in s3_client.upload_part.call_args_list]
+    assert part_sizes == [DEFAULT_PART_SIZE, DEFAULT_PART_SIZE, 4 * MiB]
+    assert result.size == len(content)
+    assert result.sha256 == hashlib.sha256(content).hexdigest()
+    assert s3_client.get_object(Bucket=BUCKET, Key="uploads/test")["Body"].read() == content
+
+
+def test_rejects_files_above_max_size(s3_client):
+    body = multipart_body(file_part("file", "large.mp4", b"x" * (2 * MiB)))
+
+    with pytest.raises(HTTPException) as exc_info:
+        upload(s3_client, body, max_size=MiB)
+
+    assert exc_info.value.status_code == 413
+    s3_client.abort_multipart_upload.assert_called_once()
+    assert "Uploads" not in s3_client.list_multipart_uploads(Bucket=BUCKET)
+    assert "Contents" not in s3_client.list_objects_v2(Bucket=BUCKET)
+
+
+def test_rejects_truncated_body(s3_client):
+    body = multipart_body(file_part("file", "video.mp4", b"x" * MiB))
+    truncated = body[: len(body) // 2]
+
+    with pytest.raises(HTTPException) as exc_info:
+        upload(s3_client, truncated)
+
+    assert exc_info.value.status_code == 400
+    s3_client.abort_multipart_upload.assert_called_once()
+    assert "Contents" not in s3_client.list_objects_v2(Bucket=BUCKET)
+
+
+def test_rejects_non_multipart_body(s3_client):
+    with pytest.raises(HTTPException) as exc_info:
+        asyncio.run(
+            stream_multipart_file_to_s3(chunked(b"{}"), "application/json", s3_client, BUCKET, "uploads/test", MiB)
+        )
+
+    assert exc_info.value.status_code == 415
@@ -0,0 +1,43 @@
+import asyncio
+from typing import Optional
+
+import pytest
+from fastapi import HTTPException
+from starlette.requests import Request
+
+from app.routers.upload import stream_upload
+
+
+def make_request(headers: dict[str, str], user_id: Optional[str] = None) -> Request:
+    scope = {
+        "type": "http",
+        "method": "POST",
+        "path": "/upload",
+        "headers": [(name.lower().encode(), value.encode()) for name, value in headers.items()],
+        "state": {} if user_id is None else {"user_id": user_id},
+    }
+    return Request(scope)
+
+
+def test_rejects_requests_without_a_user():
+    with pytest.raises(HTTPException) as exc_info:
+        asyncio.run(stream_upload(make_request({"content-length": "10"})))
+
+    assert exc_info.value.status_code == 401
+
+
+@pytest.mark.parametrize("content_length", ["abc", "-1", "1e3", ""])
+def test_rejects_malformed_content_length(content_length):
+    with pytest.raises(HTTPException) as exc_info:
+        asyncio.run(stream_upload(make_request({"content-length": content_length}, user_id="user-1")))
+
+    assert exc_info.value.status_code == 400
+
+
+def test_rejects_content_length_above_max_size():
+    request = make_request({"content-length": str(10 * 1024**3)}, user_id="user-1")
+
+    with pytest.raises(HTTPException) as exc_info:
+        asyncio.run(stream_upload(request))
+
+    assert exc_info.value.status_code == 413
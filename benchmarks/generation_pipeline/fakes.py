@@ -0,0 +1,214 @@
+"""
+Local stand-ins for the external services the generation pipeline calls.
+Every fake sleeps for a fixed, configurable latency so benchmark runs are reproducible
+and only our own code (rendering, serialization, number of calls) moves the numbers.
+"""
+
+import functools
+import http.server
+import json
+import os
+import shutil
+import socketserver
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Iterator
+from typing import Optional
+from unittest import mock
+
+from dagster import ConfigurableResource
+from facebook_business.api import FacebookAdsApi
+from facebook_business.api import FacebookResponse
+from facebook_business.session import FacebookSession
+from PIL import Image
+from resources.secret_manager_resource import SecretManagerResource
+
+SCENE_IMAGES = 5
+EMBEDDING_SIZE = 1536
+
+PRODUCT_PAGE = """
+<html>
+  <head><title>Benchmark Product</title></head>
+  <body>
+    <h1>Benchmark Product</h1>
+    <p>A product page served locally for the generation pipeline benchmark.</p>
+    {images}
+  </body>
+</html>
+"""
+
+
+class FixtureServer:
+    """Serves a product page and scene images over HTTP from a temporary directory."""
+
+    def __init__(self, root_dir: str):
+        self.root_dir = Path(root_dir)
+        self._server = None
+
+    def __enter__(self) -> "FixtureServer":
+        self.root_dir.mkdir(parents=True, exist_ok=True)
+        for i in range(SCENE_IMAGES):
+            Image.new("RGB", (1080, 1920), color=(40 * i, 80, 160)).save(self.root_dir / f"scene_{i}.jpg")
+        images = "\n".join(f'<img src="/scene_{i}.jpg">' for i in range(SCENE_IMAGES))
+        (self.root_dir / "product.html").write_text(PRODUCT_PAGE.format(images=images))
+
+        handler = functools.partial(QuietHandler, directory=str(self.root_dir))
+        self._server = socketserver.ThreadingTCPServer(("127.0.0.1", 0), handler)
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._server.shutdown()
+        self._server.server_close()
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address
+        return f"http://{host}:{port}"
+
+    @property
+    def product_url(self) -> str:
+        return f"{self.base_url}/product.html"
+
+    @property
+    def image_urls(self) -> list[str]:
+        return [f"{self.base_url}/scene_{i}.jpg" for i in range(SCENE_IMAGES)]
+
+
+class QuietHandler(http.server.SimpleHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+
+class FakeSegmindResource(ConfigurableResource):
+    image_url: str
+    latency_seconds: float = 8.0
+
+    def replace_bg(self, source_image_url: str, background_prompt: str, timeout: Optional[int] = None) -> str:
+        time.sleep(self.latency_seconds)
+        return self.image_url
+
+
+class FakeNaturalSelectionStorage(ConfigurableResource):
+    """In-process S3 stand-in: objects are copied under `root_dir` at a fixed bandwidth."""
+
+    root_dir: str
+    bandwidth_mb_per_second: float = 50.0
+
+    def save_filepath_s3(self, local_path: str, s3_path: str) -> str:
+        destination = Path(self.root_dir) / s3_path
+        destination.parent.mkdir(parents=True, exist_ok=True)
+        shutil.copyfile(local_path, destination)
+        time.sleep(os.path.getsize(local_path) / (self.bandwidth_mb_per_second * 1024 * 1024))
+        return destination.as_uri()
+
+
+class FakeCloudwatchMetricsResourceV2(ConfigurableResource):
+    def create_track_execution_unit(self):
+        return SimpleNamespace(track_success=lambda *args, **kwargs: None)
+
+
+class FakeSecretManagerResource(SecretManagerResource):
+    def get_secret(self, name: str) -> str:
+        return f"fake-{name.lower()}"
+
+
+@contextmanager
+def fake_openai(image_url: str, latency_seconds: float = 3.0) -> Iterator[None]:
+    """
+    Every completion returns the union of the keys the pipeline reads,
+    so the same canned response serves all prompts.
+    """
+    completion = {
+        "image_url": image_url,
+        "explanation": "benchmark",
+        "audiences": [{"name": "Benchmark audience", "platform": "meta", "description": "benchmark"}],
+        "prompt": "a clean studio background",
+        "headline": "Benchmark headline",
+        "primary_text": "Benchmark primary text",
+        "description": "Benchmark description",
+        "background_music_prompt": "upbeat",
+    }
+
+    def make_completion_call(*args, **kwargs):
+        time.sleep(latency_seconds)
+        return dict(completion)
+
+    def get_embedding(*args, **kwargs):
+        time.sleep(latency_seconds / 10)
+        return [1.0 / EMBEDDING_SIZE] * EMBEDDING_SIZE
+
+    def run_assistant(*args, **kwargs):
+        time.sleep(latency_seconds * 3)
+        yield json.dumps(completion)
+
+    with (
+        mock.patch("common.openai_client.ChatCompletionService.make_completion_call", make_completion_call),
+        mock.patch("common.openai_client.EmbeddingService.get_embedding", get_embedding),
+        mock.patch("common.openai_client.AssistantsService.create_thread", lambda *args: "thread_benchmark"),
+        mock.patch("common.openai_client.AssistantsService.run_assistant", run_assistant),
+    ):
+        yield
+
+
+class FakeExa:
+    latency_seconds = 2.0
+
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def _results(self):
+        time.sleep(self.latency_seconds)
+        result = SimpleNamespace(title="Competitor", url="https://example.com", text="text", summary="summary")
+        return SimpleNamespace(results=[result])
+
+    def find_similar_and_contents(self, *args, **kwargs):
+        return self._results()
+
+    def search_and_contents(self, *args, **kwargs):
+        return self._results()
+
+
+@contextmanager
+def fake_exa(latency_seconds: float = 2.0) -> Iterator[None]:
+    with mock.patch.object(FakeExa, "latency_seconds", latency_seconds), mock.patch("vox.vox_resource.Exa", FakeExa):
+        yield
+
+
+class FakeGraphApi(FacebookAdsApi):
+    """
+    Answers every Graph API call locally. The response is the union of the fields the
+    create/upload flows read (object id, image hashes, chunked video upload offsets).
+    """
+
+    def __init__(self, latency_seconds: float):
+        super().__init__(FacebookSession(access_token="fake-graph-api-token"))
+        self.latency_seconds = latency_seconds
+
+    def call(self, method, path, params=None, headers=None, files=None, url_override=None, api_version=None):
+        time.sleep(self.latency_seconds)
+        object_id = str(uuid.uuid4().int)[:15]
+        body = {
+            "id": object_id,
+            "success": True,
+            "video_id": object_id,
+            "upload_session_id": object_id,
+            "start_offset": "0",
+            "end_offset": "0",
+            "images": {"image": {"hash": uuid.uuid4().hex}},
+        }
+        return FacebookResponse(body=json.dumps(body), http_status=200, headers={}, call=None)
+
+
+@contextmanager
+def fake_graph_api(latency_seconds: float = 0.5) -> Iterator[None]:
+    previous_api = FacebookAdsApi.get_default_api()
+    FacebookAdsApi.set_default_api(FakeGraphApi(latency_seconds))
+    try:
+        yield
+    finally:
+        FacebookAdsApi.set_default_api(previous_api)
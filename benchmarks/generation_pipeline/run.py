@@ -0,0 +1,189 @@
+"""
+End-to-end benchmark of the generation pipeline against local fakes.
+
+Runs VoxResource.get_combinations, the build_videogen_combination graph (Segmind background
+replacement, real merge_videos rendering, S3 upload) and MetaAdsResource.launch_ad for each
+combination. Segmind, OpenAI, Exa, S3 and the Graph API are replaced by the fakes in
+`fakes.py`, so only the warehouse (the local dev database) and rendering are real.
+
+    python -m benchmarks.generation_pipeline.run --generation-id <id> --output bench.json
+    python -m benchmarks.generation_pipeline.run --generation-id <id> --baseline bench.json
+
+With --baseline, the run fails when a stage's p95 latency, its number of calls per
+generation, or the overall throughput regresses by more than --tolerance.
+
+The pipeline writes to the warehouse: get_combinations updates the generation and creates its
+combinations, and update_combination stores the rendered videos. Restore the seeded dev
+warehouse before every run, and pass distinct seeded generations (--generation-id can be
+repeated) rather than running the same one twice, so every run starts from the same state.
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any
+from typing import Dict
+from typing import List
+
+import dagster as dg
+from ad_platform_integrations.meta_ads_resource import MetaAdsIntegration
+from ad_platform_integrations.meta_ads_resource import MetaAdsResource
+from instrument import spans
+from resources.pg_warehouse_resource import PGWarehouseResource
+from resources.videogen.merge_video_resource import MergeVideoResource
+from videogen.build_videogen_combination import build_videogen_combination
+from vox.vox_resource import VoxResource
+
+from benchmarks.generation_pipeline.fakes import FakeCloudwatchMetricsResourceV2
+from benchmarks.generation_pipeline.fakes import FakeNaturalSelectionStorage
+from benchmarks.generation_pipeline.fakes import FakeSecretManagerResource
+from benchmarks.generation_pipeline.fakes import FakeSegmindResource
+from benchmarks.generation_pipeline.fakes import FixtureServer
+from benchmarks.generation_pipeline.fakes import fake_exa
+from benchmarks.generation_pipeline.fakes import fake_graph_api
+from benchmarks.generation_pipeline.fakes import fake_openai
+
+BENCHMARK_INTEGRATION = MetaAdsIntegration(
+    access_token="fake-graph-api-token",
+    token_type="bearer",
+    meta_business_id="1",
+    meta_business_name="Benchmark",
+    meta_adaccount_id="1",
+    meta_adaccount_name="Benchmark",
+    pixel_id="1",
+    page_id="1",
+    instagram_actor_id="1",
+    publisher_platforms=[],
+    facebook_positions=[],
+    instagram_positions=[],
+    audience_network_positions=[],
+    messenger_positions=[],
+    device_platforms=[],
+    custom_audiences=[],
+)
+
+
+def run_pipeline(generation_ids: List[str], work_dir: Path, latency_scale: float) -> float:
+    with (
+        FixtureServer(str(work_dir / "fixtures")) as fixtures,
+        fake_openai(fixtures.image_urls[0], latency_seconds=3.0 * latency_scale),
+        fake_exa(latency_seconds=2.0 * latency_scale),
+        fake_graph_api(latency_seconds=0.5 * latency_scale),
+    ):
+        pg_warehouse_resource = PGWarehouseResource()
+        job = build_videogen_combination.to_job(
+            name="benchmark_build_videogen_combination",
+            executor_def=dg.in_process_executor,
+            resource_defs={
+                "pg_warehouse_resource": pg_warehouse_resource,
+                "segmind_resource": FakeSegmindResource(
+                    image_url=fixtures.image_urls[1], latency_seconds=8.0 * latency_scale
+                ),
+                "cloudwatch_metrics_resource_v2": FakeCloudwatchMetricsResourceV2(),
+                "merge_video_resource": MergeVideoResource(),
+                "natural_selection_storage": FakeNaturalSelectionStorage(root_dir=str(work_dir / "s3")),
+            },
+        )
+        resources = {
+            "vox_resource": VoxResource(
+                secret_manager=FakeSecretManagerResource(), pg_warehouse_resource=pg_warehouse_resource
+            ),
+            "meta_ads_resource": MetaAdsResource(),
+        }
+        instance = dg.DagsterInstance.ephemeral()
+        with dg.build_resources(resources) as initialized:
+            start = time.perf_counter()
+            for generation_id in generation_ids:
+                with spans.span("pipeline.generation", trace_id=generation_id):
+                    combinations = initialized.vox_resource.get_combinations(
+                        generation_id, fixtures.product_url, fixtures.image_urls
+                    )
+                    for combination in combinations:
+                        with spans.span("pipeline.combination", trace_id=combination.id):
+                            result = job.execute_in_process(
+                                input_values={"combination_id": combination.id}, instance=instance
+                            )
+                            initialized.meta_ads_resource.launch_ad(
+                                BENCHMARK_INTEGRATION, result.output_value(), daily_budget_usd=10.0
+                            )
+            return time.perf_counter() - start
+
+
+def find_regressions(current: Dict[str, Any], baseline: Dict[str, Any], tolerance: float) -> List[str]:
+    regressions = []
+    if current["generations_per_minute"] < baseline["generations_per_minute"] * (1 - tolerance):
+        regressions.append(
+            f"throughput: {current['generations_per_minute']:.2f} generations/min "
+            f"(baseline {baseline['generations_per_minute']:.2f})"
+        )
+    for stage, baseline_stats in baseline["stages"].items():
+        stats = current["stages"].get(stage)
+        if stats is None:
+            continue
+        if stats["p95"] > baseline_stats["p95"] * (1 + tolerance):
+            regressions.append(f"{stage}: p95 {stats['p95']:.3f}s (baseline {baseline_stats['p95']:.3f}s)")
+        if stats["calls_per_generation"] > baseline_stats["calls_per_generation"]:
+            regressions.append(
+                f"{stage}: {stats['calls_per_generation']:.1f} calls per generation "
+                f"(baseline {baseline_stats['calls_per_generation']:.1f})"
+            )
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument(
+        "--generation-id",
+        action="append",
+        required=True,
+        help="generation seeded in the local warehouse, can be repeated",
+    )
+    parser.add_argument("--latency-scale", type=float, default=1.0, help="multiplier for every fake's latency")
+    parser.add_argument("--output", help="write the results as JSON, to be used as a later --baseline")
+    parser.add_argument("--baseline", help="results of a previous run to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.2)
+    args = parser.parse_args()
+
+    if len(set(args.generation_id)) != len(args.generation_id):
+        parser.error("each --generation-id is processed once per run, pass distinct seeded generations")
+    generation_ids = args.generation_id
+    with tempfile.TemporaryDirectory() as work_dir:
+        export_dir = Path(work_dir) / "spans"
+        export_dir.mkdir()
+        os.environ[spans.SPAN_EXPORT_DIR_ENV] = str(export_dir)
+        elapsed = run_pipeline(generation_ids, Path(work_dir), args.latency_scale)
+        summary = spans.summarize(spans.load_spans(str(export_dir)))
+
+    for stats in summary.values():
+        stats["calls_per_generation"] = stats["count"] / len(generation_ids)
+    results = {
+        "generations": len(generation_ids),
+        "latency_scale": args.latency_scale,
+        "elapsed_seconds": elapsed,
+        "generations_per_minute": len(generation_ids) / elapsed * 60,
+        "stages": summary,
+    }
+    print(spans.format_summary(summary))
+    print(f"\n{results['generations_per_minute']:.2f} generations/min over {len(generation_ids)} generations")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        if baseline["latency_scale"] != args.latency_scale:
+            sys.exit(f"Baseline was recorded with --latency-scale {baseline['latency_scale']}")
+        regressions = find_regressions(results, baseline, args.tolerance)
+        if regressions:
+            print("\nRegressions against baseline:\n  " + "\n  ".join(regressions))
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
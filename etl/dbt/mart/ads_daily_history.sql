@@ -1,10 +1,56 @@
+{#
+    Incremental: only the last `ads_daily_history_lookback_days` days (default 28, Meta's
+    attribution window) are reprocessed, since Meta restates insights within that window.
+    Use --full-refresh to rebuild the whole history.
 
-{#{{ config(#}
-{#    materialized='table',#}
-{#    indexes=[#}
-{#        {'columns': ['ad_id', 'insight_date']},#}
-{#    ]#}
-{#)}}#}
+    Columns coming from latest_insights (names, adset status...) are the latest values per ad.
+    Rows outside the lookback window are not reprocessed, so the post hook copies the latest
+    values from the window onto older rows of the same ad when they changed.
+#}
+{{ config(
+    materialized='incremental',
+    incremental_strategy='delete+insert',
+    unique_key=['ad_id', 'insight_date', 'gender', 'age'],
+    indexes=[
+        {'columns': ['ad_id', 'insight_date', 'gender', 'age']},
+    ],
+    post_hook="
+        update {{ this }} t
+        set integration_id    = l.integration_id,
+            account_id        = l.account_id,
+            campaign_id       = l.campaign_id,
+            adset_id          = l.adset_id,
+            account_name      = l.account_name,
+            campaign_name     = l.campaign_name,
+            adset_name        = l.adset_name,
+            ad_name           = l.ad_name,
+            objective         = l.objective,
+            adset_is_active   = l.adset_is_active,
+            adset_is_learning = l.adset_is_learning
+        from (
+               select distinct on (ad_id) *
+               from {{ this }}
+               where insight_date >= (select max(insight_date) - interval '{{ var('ads_daily_history_lookback_days', 28) }} days'
+                                      from {{ this }})
+               order by ad_id, insight_date desc
+             ) l
+        where t.ad_id = l.ad_id
+          and (t.integration_id, t.account_id, t.campaign_id, t.adset_id, t.account_name, t.campaign_name,
+               t.adset_name, t.ad_name, t.objective, t.adset_is_active, t.adset_is_learning)
+              is distinct from
+              (l.integration_id, l.account_id, l.campaign_id, l.adset_id, l.account_name, l.campaign_name,
+               l.adset_name, l.ad_name, l.objective, l.adset_is_active, l.adset_is_learning)
+    "
+) }}
+
+{%- set incremental_filter -%}
+  {% if is_incremental() %}
+    where insight_date >= coalesce(
+      (select max(insight_date) - interval '{{ var('ads_daily_history_lookback_days', 28) }} days' from {{ this }}),
+      '1900-01-01'
+    )
+  {% endif %}
+{%- endset %}
 
 with
   --
@@ -16,41 +62,34 @@ with
           (
             select *
             from {{ ref('raw_airbyte_facebook_ads_insights') }}
+            {{ incremental_filter }}
           ),
 
         insight_actions as
           (
             select *
             from {{ ref('raw_airbyte_facebook_ads_insights_actions') }}
+            {{ incremental_filter }}
           ),
 
         insight_action_values as
           (
             select *
             from {{ ref('raw_airbyte_facebook_ads_insights_action_values') }}
+            {{ incremental_filter }}
           ),
 
         latest_insights as
           (
             -- this will be used for getting the latest campaign name for example
-            with
-              --
-              insights_ranked as
-                (
-                  select *,
-                         row_number() over (
-                           partition by ad_id order by insight_date desc
-                           ) as rn
-                  from insights
-                )
-
-            select ir.*,
-                a.is_active as adset_is_active,
-                a.is_learning as adset_is_learning
-            from insights_ranked ir
+            select distinct on (i.ad_id)
+                   i.*,
+                   a.is_active as adset_is_active,
+                   a.is_learning as adset_is_learning
+            from insights i
                  left join {{ ref('raw_airbyte_facebook_ad_sets') }} a
-                           on ir.adset_id = a.id
-            where rn = 1
+                           on i.adset_id = a.id
+            order by i.ad_id, i.insight_date desc
           ),
 
 
@@ -78,7 +117,6 @@ with
             from insights
             -- do not filter by cost > 0. there are values like conversions present
             group by ad_id, insight_date, gender, age
-            order by ad_id, insight_date desc, gender, age
           ),
 
 
@@ -149,6 +187,7 @@ with
                  age,
                  sum(value) as video_view_p25
           from {{ ref('raw_airbyte_facebook_ads_insights_video_p25') }}
+          {{ incremental_filter }}
           group by ad_id, insight_date, gender, age
         ),
 
@@ -160,6 +199,7 @@ with
                  age,
                  sum(value) as video_view_p50
           from {{ ref('raw_airbyte_facebook_ads_insights_video_p50') }}
+          {{ incremental_filter }}
           group by ad_id, insight_date, gender, age
         ),
       video_p75 as
@@ -170,6 +210,7 @@ with
                  age,
                  sum(value) as video_view_p75
           from {{ ref('raw_airbyte_facebook_ads_insights_video_p75') }}
+          {{ incremental_filter }}
           group by ad_id, insight_date, gender, age
         ),
       video_p95 as
@@ -180,6 +221,7 @@ with
                  age,
                  sum(value) as video_view_p95
           from {{ ref('raw_airbyte_facebook_ads_insights_video_p95') }}
+          {{ incremental_filter }}
           group by ad_id, insight_date, gender, age
         ),
       video_p100 as
@@ -190,6 +232,7 @@ with
                  age,
                  sum(value) as video_view_p100
           from {{ ref('raw_airbyte_facebook_ads_insights_video_p100') }}
+          {{ incremental_filter }}
           group by ad_id, insight_date, gender, age
         ),
       video_avg as
@@ -200,6 +243,7 @@ with
                  age,
                  avg(value) as video_avg_play_time
           from {{ ref('raw_airbyte_facebook_ads_insights_video_avg_time') }}
+          {{ incremental_filter }}
           group by ad_id, insight_date, gender, age
         ),
       video_15s as
@@ -210,6 +254,7 @@ with
                  age,
                  sum(value) as thruplays
           from {{ ref('raw_airbyte_facebook_ads_insights_video_15s') }}
+          {{ incremental_filter }}
           group by ad_id, insight_date, gender, age
         ),
       video_plays as
@@ -220,6 +265,7 @@ with
                  age,
                  sum(value) as video_n_plays
           from {{ ref('raw_airbyte_facebook_ads_insights_video_play_actions') }}
+          {{ incremental_filter }}
           group by ad_id, insight_date, gender, age
         ),
 
@@ -352,5 +398,3 @@ with
 
 select *
 from currency_converted
-order by insight_date desc,
-         ad_id
@@ -0,0 +1,43 @@
+{#
+    One row per moment (visit) of an order's customer journey, flattened from
+    raw_airbyte_shopify_customer_journey_summary.moments.
+    Only orders reprocessed by the parent model since the last run are rebuilt. delete+insert
+    only replaces orders that still have moments, so the post hook removes the older rows of
+    every reprocessed order (e.g. its moments became empty or are no longer an array).
+#}
+{{ config(
+    materialized='incremental',
+    incremental_strategy='delete+insert',
+    unique_key='order_id',
+    indexes=[
+        {'columns': ['order_id', 'moment_index']},
+        {'columns': ['occurred_at']},
+        {'columns': ['utm_parameters'], 'type': 'gin'},
+    ],
+    post_hook="
+        delete from {{ this }} t
+        using {{ ref('raw_airbyte_shopify_customer_journey_summary') }} j
+        where t.order_id = j.order_id
+          and t._dbt_loaded_at < j._dbt_loaded_at
+    "
+) }}
+
+select j.integration_id,
+       j.shop_url,
+       j.order_id,
+       m.moment_index::int                         as moment_index,
+       (m.moment ->> 'occurred_at')::timestamptz   as occurred_at,
+       m.moment ->> 'source'                       as source,
+       m.moment ->> 'source_type'                  as source_type,
+       m.moment ->> 'landing_page'                 as landing_page,
+       m.moment ->> 'referrer_url'                 as referrer_url,
+       m.moment -> 'utm_parameters'                as utm_parameters,
+       m.moment                                    as moment,
+       j._dbt_loaded_at
+from {{ ref('raw_airbyte_shopify_customer_journey_summary') }} j
+     cross join lateral jsonb_array_elements(
+       case when json_typeof(j.moments) = 'array' then j.moments::jsonb else '[]'::jsonb end
+     ) with ordinality as m(moment, moment_index)
+{% if is_incremental() %}
+where j._dbt_loaded_at > (select coalesce(max(_dbt_loaded_at), '1900-01-01') from {{ this }})
+{% endif %}
@@ -1,3 +1,25 @@
+{#
+    Column types are unchanged for existing consumers (visits and moments stay json). Typed,
+    jsonb moments are flattened in raw_airbyte_shopify_customer_journey_moments, and the visit
+    keys read by attribution queries have expression indexes.
+
+    Incremental: orders updated in the last `shopify_customer_journey_lookback_days` days are
+    reprocessed, plus orders whose journey was not ready yet (Shopify fills it in later) for at
+    most `shopify_customer_journey_ready_max_age_days` days after the order was created.
+#}
+{{ config(
+    materialized='incremental',
+    incremental_strategy='delete+insert',
+    unique_key='order_id',
+    indexes=[
+        {'columns': ['order_id']},
+        {'columns': ["(first_visit ->> 'source')"]},
+        {'columns': ["(first_visit -> 'utm_parameters' ->> 'campaign')"]},
+        {'columns': ["(last_visit ->> 'source')"]},
+        {'columns': ["(last_visit -> 'utm_parameters' ->> 'campaign')"]},
+    ]
+) }}
+
 {%- set target_relation = adapter.get_relation(
     database=this.database,
     schema='public',
@@ -12,6 +34,19 @@ with customer_journey as
          select *,
                 customer_journey_summary::json as summary
          from airbyte_shopify_customer_journey_summary
+         {% if is_incremental() %}
+         where updated_at::timestamptz >= (
+                 select coalesce(max(updated_at) - interval '{{ var('shopify_customer_journey_lookback_days', 3) }} days',
+                                 '1900-01-01')
+                 from {{ this }}
+               )
+            or {{ int_id_to_text('id') }} in (
+                 select order_id
+                 from {{ this }}
+                 where ready is distinct from 'true'
+                   and created_at >= now() - interval '{{ var('shopify_customer_journey_ready_max_age_days', 30) }} days'
+               )
+         {% endif %}
        ),
 
      expanded as
@@ -42,23 +77,25 @@ select integration_id,
        moments_count ->> 'precision' as moment_count_precision,
        {{ json_with_id_or_null('first_visit') }} as first_visit,
        {{ json_with_id_or_null('last_visit') }} as last_visit,
-       moments
+       moments,
+       '{{ run_started_at }}'::timestamptz as _dbt_loaded_at
 from expanded
 
 {% else %}
     select
         null as integration_id,
         null as shop_url,
-	    null as order_id,
+        null as order_id,
         null::timestamptz as created_at,
         null::timestamptz as updated_at,
-        null::boolean as ready,
+        null::text as ready,
         null::bigint as days_to_conversion,
-        null::bigint as customer_order_index,
-        null::bigint as moments_count,
-        null as moments_precision,
+        null::text as customer_order_index,
+        null::text as moment_count,
+        null as moment_count_precision,
         null::json as first_visit,
         null::json as last_visit,
-        null::jsonb as moments
+        null::json as moments,
+        null::timestamptz as _dbt_loaded_at
     where false
 {% endif %}
@@ -0,0 +1,177 @@
+"""
+Lightweight span timing shared by the generation pipeline resources and ops.
+
+    with spans.span("replace_bg.segmind", trace_id=combination.id):
+        ...
+
+    @spans.timed("vox.openai.top_audiences")
+    def _get_top_audiences(...):
+        ...
+
+Spans nest within a process through a context variable and inherit the parent's trace id.
+Ops run in separate processes, so they pass the generation/combination id as `trace_id`
+to correlate their spans.
+
+When SPAN_EXPORT_DIR is set, every finished span is appended as a JSON line to
+`$SPAN_EXPORT_DIR/spans-<pid>.jsonl`. Per-stage histograms can then be printed with
+`python -m instrument.spans $SPAN_EXPORT_DIR`.
+"""
+
+import functools
+import inspect
+import json
+import logging
+import math
+import os
+import sys
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import asdict
+from dataclasses import dataclass
+from dataclasses import field
+from pathlib import Path
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import Iterator
+from typing import List
+from typing import Optional
+
+SPAN_EXPORT_DIR_ENV = "SPAN_EXPORT_DIR"
+HISTOGRAM_BUCKETS = (0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0)
+
+
+@dataclass
+class Span:
+    name: str
+    trace_id: str
+    span_id: str
+    parent_id: Optional[str]
+    start_time: float
+    duration: float = 0.0
+    error: Optional[str] = None
+    attributes: Dict[str, Any] = field(default_factory=dict)
+
+
+logger = logging.getLogger(__name__)
+
+_current_span: ContextVar[Optional[Span]] = ContextVar("current_span", default=None)
+_export_lock = threading.Lock()
+
+
+@contextmanager
+def span(name: str, trace_id: Optional[str] = None, **attributes: Any) -> Iterator[Span]:
+    parent = _current_span.get()
+    if trace_id is None:
+        trace_id = parent.trace_id if parent else uuid.uuid4().hex
+    current = Span(
+        name=name,
+        trace_id=str(trace_id),
+        span_id=uuid.uuid4().hex[:16],
+        parent_id=parent.span_id if parent else None,
+        start_time=time.time(),
+        attributes=attributes,
+    )
+    token = _current_span.set(current)
+    start = time.perf_counter()
+    try:
+        yield current
+    except BaseException as e:
+        current.error = type(e).__name__
+        raise
+    finally:
+        current.duration = time.perf_counter() - start
+        _current_span.reset(token)
+        _export(current)
+
+
+def timed(name: str) -> Callable:
+    def decorator(func: Callable) -> Callable:
+        if inspect.iscoroutinefunction(func):
+
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with span(name):
+                    return await func(*args, **kwargs)
+
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(name):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def _export(finished: Span):
+    export_dir = os.environ.get(SPAN_EXPORT_DIR_ENV)
+    if not export_dir:
+        return
+    line = json.dumps(asdict(finished), default=str)
+    # Exporting is best effort, a bad SPAN_EXPORT_DIR must never fail the pipeline step being timed
+    try:
+        with _export_lock:
+            Path(export_dir).mkdir(parents=True, exist_ok=True)
+            with open(Path(export_dir) / f"spans-{os.getpid()}.jsonl", "a") as f:
+                f.write(line + "\n")
+    except OSError as e:
+        logger.warning(f"Could not export span {finished.name} to {export_dir}: {e}")
+
+
+def load_spans(export_dir: str) -> List[Span]:
+    spans = []
+    for path in sorted(Path(export_dir).glob("spans-*.jsonl")):
+        with open(path) as f:
+            spans.extend(Span(**json.loads(line)) for line in f if line.strip())
+    return spans
+
+
+def _percentile(sorted_values: List[float], percentile: float) -> float:
+    index = max(math.ceil(percentile / 100 * len(sorted_values)) - 1, 0)
+    return sorted_values[index]
+
+
+def summarize(spans: List[Span]) -> Dict[str, Dict[str, Any]]:
+    """Per-stage latency histogram and percentiles, keyed by span name."""
+    durations: Dict[str, List[float]] = {}
+    errors: Dict[str, int] = {}
+    for s in spans:
+        durations.setdefault(s.name, []).append(s.duration)
+        errors[s.name] = errors.get(s.name, 0) + (1 if s.error else 0)
+
+    summary = {}
+    for name, values in sorted(durations.items()):
+        values.sort()
+        buckets = {str(bound): sum(1 for v in values if v <= bound) for bound in HISTOGRAM_BUCKETS}
+        buckets["+Inf"] = len(values)
+        summary[name] = {
+            "count": len(values),
+            "errors": errors[name],
+            "total": sum(values),
+            "p50": _percentile(values, 50),
+            "p95": _percentile(values, 95),
+            "p99": _percentile(values, 99),
+            "max": values[-1],
+            "buckets": buckets,
+        }
+    return summary
+
+
+def format_summary(summary: Dict[str, Dict[str, Any]]) -> str:
+    lines = [f"{'stage':<45} {'count':>6} {'p50':>9} {'p95':>9} {'p99':>9} {'max':>9}"]
+    for name, stats in summary.items():
+        lines.append(
+            f"{name:<45} {stats['count']:>6} {stats['p50']:>8.3f}s {stats['p95']:>8.3f}s "
+            f"{stats['p99']:>8.3f}s {stats['max']:>8.3f}s"
+        )
+    return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    print(format_summary(summarize(load_spans(sys.argv[1]))))
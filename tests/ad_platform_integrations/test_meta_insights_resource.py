@@ -0,0 +1,77 @@
+from datetime import date
+from unittest import mock
+
+from ad_platform_integrations.meta_insights_resource import AccountDailyTotals
+from ad_platform_integrations.meta_insights_resource import MetaInsightsResource
+
+ACCOUNT_ID = "123"
+
+
+def totals(day: date, spend: float, impressions: int) -> AccountDailyTotals:
+    return AccountDailyTotals(account_id=ACCOUNT_ID, date_start=day, spend=spend, impressions=impressions)
+
+
+def api_row(day: date, spend: str, impressions: str) -> dict:
+    return {"date_start": day.isoformat(), "date_stop": day.isoformat(), "spend": spend, "impressions": impressions}
+
+
+def test_to_date_ranges_merges_consecutive_days():
+    dates = [date(2024, 5, 3), date(2024, 5, 1), date(2024, 5, 2), date(2024, 5, 6), date(2024, 5, 8), date(2024, 5, 7)]
+
+    assert MetaInsightsResource._to_date_ranges(dates) == [
+        (date(2024, 5, 1), date(2024, 5, 3)),
+        (date(2024, 5, 6), date(2024, 5, 8)),
+    ]
+
+
+def test_to_date_ranges_keeps_isolated_days_and_month_boundaries():
+    dates = [date(2024, 4, 30), date(2024, 5, 1), date(2024, 5, 10)]
+
+    assert MetaInsightsResource._to_date_ranges(dates) == [
+        (date(2024, 4, 30), date(2024, 5, 1)),
+        (date(2024, 5, 10), date(2024, 5, 10)),
+    ]
+
+
+def test_to_date_ranges_empty():
+    assert MetaInsightsResource._to_date_ranges([]) == []
+
+
+def test_get_changed_dates_compares_spend_and_impressions():
+    unchanged, spend_changed, impressions_changed, missing = (date(2024, 5, day) for day in range(1, 5))
+    account = mock.Mock()
+    account.get_insights.return_value = [
+        api_row(unchanged, "10.004", "100"),
+        api_row(spend_changed, "12.50", "200"),
+        api_row(impressions_changed, "5.00", "301"),
+        api_row(missing, "1.00", "10"),
+    ]
+    warehouse_totals = {
+        (ACCOUNT_ID, unchanged): totals(unchanged, 10.0, 100),
+        (ACCOUNT_ID, spend_changed): totals(spend_changed, 12.0, 200),
+        (ACCOUNT_ID, impressions_changed): totals(impressions_changed, 5.0, 300),
+        ("other-account", missing): AccountDailyTotals(
+            account_id="other-account", date_start=missing, spend=1.0, impressions=10
+        ),
+    }
+
+    changed = MetaInsightsResource._get_changed_dates(
+        account, ACCOUNT_ID, date(2024, 5, 1), date(2024, 5, 4), warehouse_totals
+    )
+
+    assert changed == [spend_changed, impressions_changed, missing]
+    params = account.get_insights.call_args.kwargs["params"]
+    assert params["level"] == "account"
+    assert params["time_range"] == {"since": "2024-05-01", "until": "2024-05-04"}
+
+
+def test_get_changed_dates_treats_missing_metrics_as_zero():
+    day = date(2024, 5, 1)
+    account = mock.Mock()
+    account.get_insights.return_value = [{"date_start": day.isoformat()}]
+
+    changed = MetaInsightsResource._get_changed_dates(
+        account, ACCOUNT_ID, day, day, {(ACCOUNT_ID, day): totals(day, 0.0, 0)}
+    )
+
+    assert changed == []
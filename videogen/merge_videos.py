@@ -1,3 +1,5 @@
+from instrument import spans
+
 CREATIVE_FORMAT = "mp4"
 THUMBNAIL_FORMAT = "jpg"
 
@@ -18,13 +20,16 @@ def merge_videos(
     filename = f"{uuid4()}"  # replace uuid with hashed features to enable caching
     creative_local_path = f"{current_path}/{filename}.{CREATIVE_FORMAT}"
     thumbnail_local_path = f"{current_path}/{filename}.{THUMBNAIL_FORMAT}"
-    merge_video_resource.merge_videos(combination, image_urls, creative_local_path)
-    write_video_thumbnail(creative_local_path, thumbnail_local_path)
+    with spans.span("merge_videos.render", trace_id=combination_id):
+        merge_video_resource.merge_videos(combination, image_urls, creative_local_path)
+    with spans.span("merge_videos.thumbnail", trace_id=combination_id):
+        write_video_thumbnail(creative_local_path, thumbnail_local_path)
     sku_path = f"selection/{generation.integration_id}/{generation.name}/{combination.features.sku}"
     creative_path = f"{sku_path}/reels/{filename}.{CREATIVE_FORMAT}"
     thumbnail_path = f"{sku_path}/thumbnails/{filename}.{THUMBNAIL_FORMAT}"
-    creative_url = natural_selection_storage.save_filepath_s3(creative_local_path, creative_path)
-    thumbnail_url = natural_selection_storage.save_filepath_s3(thumbnail_local_path, thumbnail_path)
+    with spans.span("merge_videos.s3_upload", trace_id=combination_id):
+        creative_url = natural_selection_storage.save_filepath_s3(creative_local_path, creative_path)
+        thumbnail_url = natural_selection_storage.save_filepath_s3(thumbnail_local_path, thumbnail_path)
     os.remove(creative_local_path)
     os.remove(thumbnail_local_path)
     context.log.info(
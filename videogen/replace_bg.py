@@ -4,6 +4,7 @@ import dagster as dg
 from dagster import OpExecutionContext
 from dagster import op
 from instrument import sentry
+from instrument import spans
 from resources.cloudwatch_metrics_resource_v2 import CloudwatchMetricsResourceV2
 from resources.pg_warehouse_resource import PGWarehouseResource
 from resources.videogen.segmind_resource import SegmindResource
@@ -38,11 +39,12 @@ async def replace_bg(
     context.log.info(f"Replacing background for {combination.id=}")
     ex_unit = cloudwatch_metrics_resource_v2.create_track_execution_unit()
     features = combination.features
-    image_url = segmind_resource.replace_bg(
-        features.source_image_url,
-        features.background_prompt,
-        timeout=TIMEOUT_REPLACE_BG,
-    )
+    with spans.span("replace_bg.segmind", trace_id=combination.id):
+        image_url = segmind_resource.replace_bg(
+            features.source_image_url,
+            features.background_prompt,
+            timeout=TIMEOUT_REPLACE_BG,
+        )
     context.log.info(f"Background replaced: {image_url}")
     ex_unit.track_success("replace_bg")
     return image_url
@@ -16,6 +16,7 @@ from dagster import InitResourceContext
 from dagster import ResourceDependency
 from dagster import get_dagster_logger
 from exa_py import Exa
+from instrument import spans
 from pydantic import PrivateAttr
 from resources.pg_warehouse_resource import XLAUNCH_DB
 from resources.pg_warehouse_resource import PGWarehouseResource
@@ -28,6 +29,7 @@ from video_gen_v2.types.queries import update_generation
 from video_gen_v2.types.song import Song
 
 
+@spans.timed("vox.exa.find_competitors")
 def find_competitors(business_website: str, num_results: int = 10):
     exa_client = Exa(api_key="....")
     # Extract base domain from URL
@@ -55,6 +57,7 @@ def find_competitors(business_website: str, num_results: int = 10):
     ]
 
 
+@spans.timed("vox.exa.search_internet")
 def search_internet(query: str, num_results: int = 5, *args, **kwargs):
     exa_client = Exa(api_key="....")
     response = exa_client.search_and_contents(
@@ -92,18 +95,24 @@ class VoxResource(ConfigurableResource):
     def get_combinations(
         self, generation_id: str, product_url: str, source_image_urls: list[str] = []
     ):
-        ....
-        return combinations
+        # Vox runs outside the combination ops, the generation id ties its LLM, Exa and website
+        # spans to the rest of the generation's trace
+        with spans.span("vox.get_combinations", trace_id=generation_id):
+            ....
+            return combinations
 
     def _extract_data_from_website(self, url: str, image_urls: list[str] = []):
         ....
 
+    @spans.timed("vox.fetch_website_content")
     def _fetch_website_content(self, url: str, image_urls: list[str] = []):
         ....
 
+    @spans.timed("vox.openai.product_metadata")
     def _get_product_metadata(self, website_content, url):
         ....
 
+    @spans.timed("vox.openai.analyze_product_images")
     def _analyze_product_images(
         self, images_url: list[str], product_description: Optional[str] = None
     ):
@@ -150,6 +159,7 @@ class VoxResource(ConfigurableResource):
             self._logger.info(f"Explanation for the best image: {response['explanation']}")
         return response["image_url"]
 
+    @spans.timed("vox.openai.business_research")
     def _get_business_research(
         self,
         business_name,
@@ -160,6 +170,7 @@ class VoxResource(ConfigurableResource):
     ):
         ...
 
+    @spans.timed("vox.openai.run_assistant")
     def _run_assistant(self, user_message, assistant_id, images=None):
         function_map = {"find_competitors": find_competitors, "search_internet": search_internet}
         assistant = AssistantsService(
@@ -171,6 +182,7 @@ class VoxResource(ConfigurableResource):
             responses.append(response)
         return responses
 
+    @spans.timed("vox.openai.top_audiences")
     def _get_top_audiences(self, business_research, product_description):
         chat_service = ChatCompletionService(self._openai_api_key)
         system_prompt = """
@@ -192,6 +204,7 @@ class VoxResource(ConfigurableResource):
         )
         return response.get("audiences", [])
 
+    @spans.timed("vox.openai.background_image_prompt")
     def _get_background_image_prompt(self, audience, image_url):
         chat_service = ChatCompletionService(self._openai_api_key)
         system_prompt = """
@@ -212,6 +225,7 @@ class VoxResource(ConfigurableResource):
         self._logger.info(f"Background image prompt: {response.get('prompt', '')}")
         return response.get("prompt", "")
 
+    @spans.timed("vox.openai.miscellaneous_data")
     def _get_miscellaneous_data(self, audience, product_description, business_research):
         chat_service = ChatCompletionService(self._openai_api_key)
         system_prompt = """
@@ -243,6 +257,7 @@ class VoxResource(ConfigurableResource):
             song.id: model_utils.parse_vector(song.prompt_vector) for song in songs
         }
 
+    @spans.timed("vox.openai.relevant_song")
     def _get_relevant_song_id(self, background_music_prompt):
         self._load_song_vector_map()
         embedding_client = EmbeddingService(self._openai_api_key)